@@ -3,17 +3,39 @@
 from __future__ import annotations
 
 import logging
+import socket
 import subprocess
+import sys
 import time
 import signal
 import os
 import shutil
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+PR_SET_PDEATHSIG = 1
+
+
+def _linux_child_preexec() -> None:
+    """Runs in the forked child before exec (Linux only).
+
+    Puts Appium in its own session (so stop() can signal the whole group)
+    and asks the kernel to SIGTERM it if this process dies, so a crashed
+    MCP server never leaves an orphaned node process behind.
+    """
+    os.setsid()
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM, 0, 0, 0)
+    except (OSError, AttributeError):
+        pass
+
 
 class AppiumServerManager:
     """Manages Appium server lifecycle."""
@@ -29,6 +51,13 @@ class AppiumServerManager:
         self.log_file = log_file
         self.process: Optional[subprocess.Popen] = None
         self.base_path = "/"
+        # Reuse one keep-alive connection for status polls instead of opening
+        # a fresh socket on every probe during the startup wait loop.
+        self._session = requests.Session()
+        self._session.mount(
+            "http://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0),
+        )
 
     @property
     def server_url(self) -> str:
@@ -46,10 +75,18 @@ class AppiumServerManager:
 
         return None
 
+    def _port_open(self) -> bool:
+        """Cheap TCP-level liveness check before paying for an HTTP probe."""
+        try:
+            with socket.create_connection((self.host, self.port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+
     def is_running(self) -> bool:
         """Check if Appium server is running."""
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.server_url}/status",
                 timeout=2,
             )
@@ -67,8 +104,10 @@ class AppiumServerManager:
         Returns:
             True if server started successfully, False otherwise
         """
-        # Check if server is already running
-        if self.is_running():
+        # Check if server is already running. The TCP probe short-circuits
+        # the HTTP status request (and its timeout) on a cold start where
+        # nothing is listening yet.
+        if self._port_open() and self.is_running():
             logger.info(f"Appium server already running at {self.server_url}")
             return True
 
@@ -102,22 +141,34 @@ class AppiumServerManager:
             log_handle = open(log_path, "w")
             logger.info(f"Appium logs will be written to: {log_path}")
 
+        popen_kwargs: dict = {}
+        if sys.platform.startswith("linux"):
+            popen_kwargs["preexec_fn"] = _linux_child_preexec
+        elif os.name != 'nt':
+            # start_new_session keeps the posix_spawn fast path available
+            popen_kwargs["start_new_session"] = True
+
         try:
             # Start Appium server process
             self.process = subprocess.Popen(
                 cmd,
                 stdout=log_handle or subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                preexec_fn=os.setsid if os.name != 'nt' else None,
+                **popen_kwargs,
             )
 
-            # Wait for server to be ready
+            # Wait for server to be ready. Poll with exponential backoff so a
+            # fast-starting server is detected within tens of milliseconds
+            # while a slow one is not hammered with requests.
             start_time = time.time()
+            delay = 0.05
+            max_delay = 1.0
             while time.time() - start_time < timeout:
                 if self.is_running():
                     logger.info(f"Appium server started successfully at {self.server_url}")
                     return True
-                time.sleep(0.5)
+                time.sleep(delay)
+                delay = min(delay * 1.5, max_delay)
 
             # Timeout reached
             logger.error(f"Appium server failed to start within {timeout} seconds")
@@ -130,28 +181,66 @@ class AppiumServerManager:
                 log_handle.close()
             return False
 
-    def stop(self) -> None:
-        """Stop Appium server."""
+    def _reap_group(self, pgid: int, timeout: float) -> bool:
+        """Reap every exited process in the group, bounded by `timeout`.
+
+        Appium spawns node and adb helpers; waiting only on the direct
+        child can leave grandchildren (and the port) lingering. Returns
+        True once the whole tree is gone.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                pid, _ = os.waitpid(-pgid, os.WNOHANG)
+            except ChildProcessError:
+                return True  # nothing left to reap
+            if pid == 0:
+                time.sleep(0.05)
+        return False
+
+    def _stop_posix(self, grace_period: float) -> None:
+        pgid = os.getpgid(self.process.pid)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                os.killpg(pgid, sig)
+            except ProcessLookupError:
+                return
+            if self._reap_group(pgid, grace_period):
+                return
+
+        # Force kill if still running
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            return
+        self._reap_group(pgid, grace_period)
+
+    def _stop_windows(self, grace_period: float) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=grace_period)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def stop(self, grace_period: float = 1.0) -> None:
+        """
+        Stop Appium server.
+
+        Escalates SIGINT -> SIGTERM -> SIGKILL, waiting `grace_period`
+        seconds between steps so a healthy server can shut down cleanly
+        (node flushes logs on SIGINT) while a hung one is still killed.
+
+        Args:
+            grace_period: Seconds to wait after each signal before escalating
+        """
         if self.process:
             logger.info("Stopping Appium server...")
             try:
-                # Try graceful shutdown first
                 if os.name != 'nt':
-                    os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
+                    self._stop_posix(grace_period)
                 else:
-                    self.process.terminate()
-
-                # Wait for process to exit
-                try:
-                    self.process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # Force kill if still running
-                    if os.name != 'nt':
-                        os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
-                    else:
-                        self.process.kill()
-                    self.process.wait()
-
+                    self._stop_windows(grace_period)
                 logger.info("Appium server stopped")
             except Exception as e:
                 logger.error(f"Error stopping Appium server: {e}")
@@ -169,9 +258,22 @@ class AppiumServerManager:
             True if server restarted successfully, False otherwise
         """
         self.stop()
-        time.sleep(2)  # Wait a bit before restarting
+        self._wait_for_port_release()
         return self.start(timeout)
 
+    def _wait_for_port_release(self, timeout: float = 5.0) -> None:
+        """Poll until the server port is free instead of sleeping a fixed 2s."""
+        deadline = time.time() + timeout
+        delay = 0.05
+        while time.time() < deadline:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.2)
+                if sock.connect_ex((self.host, self.port)) != 0:
+                    return
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+        logger.warning(f"Port {self.port} still in use after {timeout} seconds")
+
     def __enter__(self):
         """Context manager entry."""
         self.start()
@@ -180,3 +282,4 @@ class AppiumServerManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.stop()
+        self._session.close()
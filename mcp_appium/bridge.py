@@ -1,17 +1,16 @@
 from __future__ import annotations
 
 import logging
+import os
+import selectors
+from collections import deque
 import subprocess
 import time
-from typing import List, Sequence
+from typing import TYPE_CHECKING, ClassVar, Dict, List, Sequence
 
-from appium import webdriver
-from appium.options.android import UiAutomator2Options
-from appium.options.ios import XCUITestOptions
-from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.common.actions import interaction
-from selenium.webdriver.common.actions.action_builder import ActionBuilder
-from selenium.webdriver.common.actions.pointer_input import PointerInput
+if TYPE_CHECKING:
+    from appium import webdriver
+    from selenium.webdriver.common.actions.action_builder import ActionBuilder
 
 from .config import AppiumConfig
 from .llm_client import LLMClient
@@ -21,10 +20,56 @@ from .action_types import PlannedAction
 
 logger = logging.getLogger(__name__)
 
+_webdriver_loaded = False
+
+
+def _load_webdriver() -> None:
+    """Import the heavy appium/selenium stack once, on first use.
+
+    These imports dominate CLI cold start, so defer them until a driver is
+    actually needed instead of paying for them on `--help` and config checks.
+    """
+    global webdriver, UiAutomator2Options, XCUITestOptions, AppiumBy
+    global interaction, ActionBuilder, PointerInput
+    global NoSuchElementException, StaleElementReferenceException
+    global WebDriverException, _webdriver_loaded
+    if _webdriver_loaded:
+        return
+    from appium import webdriver
+    from appium.options.android import UiAutomator2Options
+    from appium.options.ios import XCUITestOptions
+    from appium.webdriver.common.appiumby import AppiumBy
+    from selenium.common.exceptions import (
+        NoSuchElementException,
+        StaleElementReferenceException,
+        WebDriverException,
+    )
+    from selenium.webdriver.common.actions import interaction
+    from selenium.webdriver.common.actions.action_builder import ActionBuilder
+    from selenium.webdriver.common.actions.pointer_input import PointerInput
+
+    _webdriver_loaded = True
+
 
 class AppiumBridge:
     """Coordinates Appium, adb dumps and the LLM planner."""
 
+    # Built lazily on first lookup because AppiumBy is imported on demand
+    _STRATEGY_MAP: ClassVar[Dict[str, str] | None] = None
+
+    @classmethod
+    def _strategy_map(cls) -> Dict[str, str]:
+        if cls._STRATEGY_MAP is None:
+            _load_webdriver()
+            cls._STRATEGY_MAP = {
+                "id": AppiumBy.ID,
+                "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
+                "xpath": AppiumBy.XPATH,
+                "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
+                "ios_predicate": AppiumBy.IOS_PREDICATE,
+            }
+        return cls._STRATEGY_MAP
+
     def __init__(
         self,
         config: AppiumConfig,
@@ -36,6 +81,21 @@ class AppiumBridge:
         self.prompt_builder = prompt_builder or PromptBuilder(config.to_prompt_payload())
         self.driver: webdriver.Remote | None = None
         self.current_nodes: List[NodeSnapshot] = []
+        self._adb_proc: subprocess.Popen | None = None
+        # Capabilities are fixed per config, so the Options object built from
+        # them is reused across reconnects instead of re-validated each time
+        self._options = None
+        self._window_size: dict | None = None
+        # Keyboard state sampled once per executed plan (None = unknown)
+        self._keyboard_shown: bool | None = None
+        # Short-lived (strategy, value) -> element cache; planners often
+        # target the same locator on consecutive actions within a turn
+        self._elem_cache: Dict[tuple, tuple] = {}
+        # Serialized prompt payload keyed by current_nodes identity
+        self._nodes_payload_cache: tuple | None = None
+        # PointerInput is stateless, so one instance can back every gesture
+        # (created lazily once the selenium stack is imported)
+        self._touch_pointer = None
 
     # Connection --------------------------------------------------------------
     def connect(self, max_retries: int = 3, retry_delay: int = 2) -> None:
@@ -51,25 +111,29 @@ class AppiumBridge:
                 logger.warning("Existing driver connection is stale (%s), reconnecting...", str(e))
                 try:
                     self.driver.quit()
-                except:
+                except WebDriverException:
                     pass
                 self.driver = None
 
         logger.info("Connecting to Appium server at %s", self.config.server_url)
+        _load_webdriver()
 
-        # Convert capabilities dict to Options object
-        caps = self.config.capabilities
-        platform = caps.get("platformName", "").lower()
+        # Convert capabilities dict to Options object (memoized per config)
+        if self._options is None:
+            caps = self.config.capabilities
+            platform = caps.get("platformName", "").lower()
 
-        if platform == "android":
-            options = UiAutomator2Options()
-        elif platform == "ios":
-            options = XCUITestOptions()
-        else:
-            raise ValueError(f"Unsupported platform: {platform}")
+            if platform == "android":
+                options = UiAutomator2Options()
+            elif platform == "ios":
+                options = XCUITestOptions()
+            else:
+                raise ValueError(f"Unsupported platform: {platform}")
 
-        # Load capabilities into options
-        options.load_capabilities(caps)
+            # Load capabilities into options
+            options.load_capabilities(caps)
+            self._options = options
+        options = self._options
 
         # Retry logic for connection stability
         last_error = None
@@ -77,6 +141,7 @@ class AppiumBridge:
             try:
                 logger.info("Connection attempt %d/%d", attempt + 1, max_retries)
                 self.driver = webdriver.Remote(self.config.server_url, options=options)
+                self._elem_cache.clear()
                 logger.info("Successfully connected to device (session: %s)", self.driver.session_id)
                 return
             except Exception as e:
@@ -94,8 +159,21 @@ class AppiumBridge:
     def disconnect(self) -> None:
         if self.driver:
             logger.info("Closing Appium session")
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            except WebDriverException as exc:
+                logger.debug("Ignoring error while quitting session: %s", exc)
             self.driver = None
+        self._window_size = None
+        self._elem_cache.clear()
+        self._close_adb_shell()
+
+    def _touch_actions(self) -> "ActionBuilder":
+        """Build a W3C touch action chain against the current driver."""
+        _load_webdriver()
+        if self._touch_pointer is None:
+            self._touch_pointer = PointerInput(interaction.POINTER_TOUCH, "touch")
+        return ActionBuilder(self.driver, mouse=self._touch_pointer)
 
     # Data collection ---------------------------------------------------------
     def collect_nodes(self) -> List[NodeSnapshot]:
@@ -112,13 +190,117 @@ class AppiumBridge:
         xml = self.driver.page_source
         return NodeParser.parse_xml(xml)
 
+    _ADB_SENTINEL = "__MCP_APPIUM_END__"
+
+    def _ensure_adb_shell(self) -> subprocess.Popen | None:
+        """Lazily start (and reuse) a long-lived `adb shell` pipe.
+
+        Forking a fresh adb binary per planner turn costs a full spawn plus
+        adb-server handshake; streaming commands over one shell avoids it.
+        """
+        if self._adb_proc and self._adb_proc.poll() is None:
+            return self._adb_proc
+        try:
+            self._adb_proc = subprocess.Popen(
+                [self.config.adb_binary, "shell"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except (FileNotFoundError, OSError) as exc:
+            logger.debug("Could not start persistent adb shell: %s", exc)
+            self._adb_proc = None
+        return self._adb_proc
+
+    def _close_adb_shell(self) -> None:
+        if not self._adb_proc:
+            return
+        proc = self._adb_proc
+        self._adb_proc = None
+        try:
+            proc.terminate()
+            try:
+                proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        except Exception as exc:
+            logger.debug("Error closing adb shell: %s", exc)
+
+    def _adb_shell_run(self, command: str, timeout: float = 10.0) -> str | None:
+        """Run a command over the persistent adb shell, reading to a sentinel.
+
+        Returns None when the pipe is unusable so callers can fall back to a
+        one-shot subprocess.
+        """
+        if os.name == 'nt':  # selectors don't support pipe polling on Windows
+            return None
+        proc = self._ensure_adb_shell()
+        if not proc or not proc.stdin or not proc.stdout:
+            return None
+
+        try:
+            proc.stdin.write(f"{command}; echo {self._ADB_SENTINEL}$?\n")
+            proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self._close_adb_shell()
+            return None
+
+        # Read the raw fd and split lines ourselves: readline() on the
+        # buffered text wrapper can slurp the sentinel into the Python
+        # buffer in one fd read, after which select() blocks on an empty
+        # kernel pipe until the deadline even though the answer arrived.
+        fd = proc.stdout.fileno()
+        buf = b""
+        lines: List[str] = []
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error("adb shell command timed out after %.0f seconds", timeout)
+                    self._close_adb_shell()
+                    return None
+                if not selector.select(timeout=remaining):
+                    continue
+                try:
+                    chunk = os.read(fd, 65536)
+                except OSError:
+                    chunk = b""
+                if not chunk:  # pipe closed underneath us
+                    self._close_adb_shell()
+                    return None
+                buf += chunk
+                while True:
+                    newline = buf.find(b"\n")
+                    if newline < 0:
+                        break
+                    raw, buf = buf[: newline + 1], buf[newline + 1:]
+                    line = raw.decode("utf-8", "replace").replace("\r\n", "\n")
+                    if line.startswith(self._ADB_SENTINEL):
+                        exit_code = line[len(self._ADB_SENTINEL):].strip()
+                        if exit_code != "0":
+                            logger.error("adb shell command failed with exit code %s", exit_code)
+                            return None
+                        return "".join(lines)
+                    lines.append(line)
+
     def _collect_accessibility_dump(self) -> str:
+        dump = self._adb_shell_run("dumpsys accessibility")
+        if dump is not None:
+            return dump
+
         try:
+            # Capture raw bytes and decode once: text=True would decode the
+            # (potentially multi-MB) dump incrementally with universal
+            # newlines, costing an extra scan over the whole buffer.
             result = subprocess.run(
                 [self.config.adb_binary, "shell", "dumpsys", "accessibility"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
                 check=False,
                 timeout=10,  # Add timeout to prevent hanging
             )
@@ -130,30 +312,28 @@ class AppiumBridge:
             return ""
 
         if result.returncode != 0:
-            logger.error("adb dumpsys failed: %s", result.stderr.strip())
+            stderr = result.stderr.decode("utf-8", "replace").strip()
+            logger.error("adb dumpsys failed: %s", stderr)
             return ""
-        return result.stdout
+        return result.stdout.decode("utf-8", "replace")
 
     # Planning/execution ------------------------------------------------------
     def run_instruction(self, request: str, max_turns: int = 4) -> List[PlannedAction]:
         self.connect()
         executed_actions: List[PlannedAction] = []
         self.current_nodes = self.collect_nodes()
-        history: List[str] = []
+        # Newest entry first; maxlen keeps only the window the prompt uses
+        history: deque[str] = deque(maxlen=6)
 
         for turn in range(max_turns):
             logger.info("Planning turn %d", turn + 1)
-            history_text = "\n".join(reversed(history[-6:]))
+            history_text = "\n".join(history)
             prompt = self.prompt_builder.build(request, self.current_nodes, history_text)
-            plan = self.llm.plan_actions(
-                prompt,
-                fallback_nodes=[
-                    {**node.as_dict(), "index": idx + 1} for idx, node in enumerate(self.current_nodes)
-                ],
-            )
+            plan = self.llm.plan_actions(prompt, fallback_nodes=self._nodes_payload())
             logger.info("LLM produced %d actions", len(plan.actions))
             exec_log = self._execute_plan(plan.actions)
-            history.extend(exec_log)
+            for entry in exec_log:
+                history.appendleft(entry)
             executed_actions.extend(plan.actions)
 
             if not plan.request_refresh:
@@ -164,37 +344,49 @@ class AppiumBridge:
 
         return executed_actions
 
+    def _nodes_payload(self) -> List[Dict]:
+        """Serialize current nodes for the LLM, reused until nodes are recollected."""
+        # Key on the list object itself (held by the cache tuple), not its
+        # id(): a freed list's id is routinely recycled by the next
+        # collect_nodes() result, which would serve the previous screen
+        nodes = self.current_nodes
+        cache = self._nodes_payload_cache
+        if cache and cache[0] is nodes:
+            return cache[1]
+        payload = [
+            {**node.as_dict(), "index": idx + 1} for idx, node in enumerate(nodes)
+        ]
+        self._nodes_payload_cache = (nodes, payload)
+        return payload
+
     def _execute_plan(self, plan: Sequence[PlannedAction]) -> List[str]:
         if not self.driver:
             raise RuntimeError("Driver not connected")
 
         logs: List[str] = []
 
+        # Sample keyboard state once for the whole batch so element lookups
+        # don't pay a hide-keyboard retry round-trip when no keyboard is up.
+        self._keyboard_shown = self._is_keyboard_shown()
+
+        try:
+            return self._execute_plan_actions(plan, logs)
+        finally:
+            self._keyboard_shown = None
+
+    def _execute_plan_actions(self, plan: Sequence[PlannedAction], logs: List[str]) -> List[str]:
         for action in plan:
             logger.info("Executing %s", action.describe())
             try:
-                if action.name == "tap":
-                    self._tap(action)
-                elif action.name == "input_text":
-                    self._input(action)
-                elif action.name == "wait":
-                    duration = float(action.value or 1.0)
-                    time.sleep(duration)
-                elif action.name == "assert_text":
-                    self._assert_text(action)
-                elif action.name == "swipe":
-                    self._swipe(action)
-                elif action.name == "long_press":
-                    self._long_press(action)
-                elif action.name == "back":
-                    self._back()
-                elif action.name == "hide_keyboard":
-                    self._hide_keyboard()
-                elif action.name == "scroll_down":
-                    self._scroll_down()
-                elif action.name == "scroll_up":
-                    self._scroll_up()
-                else:
+                try:
+                    supported = self._dispatch_action(action)
+                except StaleElementReferenceException:
+                    # A cached element outlived its TTL screen; evict the
+                    # cache and resolve fresh once instead of aborting
+                    self._elem_cache.clear()
+                    logger.info("Cached element went stale, retrying %s", action.name)
+                    supported = self._dispatch_action(action)
+                if not supported:
                     logger.warning("Skipping unsupported action: %s", action.name)
                     logs.append(f"skip:{action.describe()}")
                     continue
@@ -206,6 +398,33 @@ class AppiumBridge:
 
         return logs
 
+    def _dispatch_action(self, action: PlannedAction) -> bool:
+        """Run one planned action; returns False for unsupported names."""
+        if action.name == "tap":
+            self._tap(action)
+        elif action.name == "input_text":
+            self._input(action)
+        elif action.name == "wait":
+            duration = float(action.value or 1.0)
+            time.sleep(duration)
+        elif action.name == "assert_text":
+            self._assert_text(action)
+        elif action.name == "swipe":
+            self._swipe(action)
+        elif action.name == "long_press":
+            self._long_press(action)
+        elif action.name == "back":
+            self._back()
+        elif action.name == "hide_keyboard":
+            self._hide_keyboard()
+        elif action.name == "scroll_down":
+            self._scroll_down()
+        elif action.name == "scroll_up":
+            self._scroll_up()
+        else:
+            return False
+        return True
+
     # Action helpers ----------------------------------------------------------
     def _tap(self, action: PlannedAction) -> None:
         element = self._resolve_element(action)
@@ -217,7 +436,7 @@ class AppiumBridge:
                 coords = self._parse_coordinates(action.metadata.get("fallback_coordinates"))
             if coords and self.driver:
                 # W3C Actions API for tap
-                actions = ActionBuilder(self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+                actions = self._touch_actions()
                 actions.pointer_action.move_to_location(coords[0], coords[1])
                 actions.pointer_action.pointer_down()
                 actions.pointer_action.pointer_up()
@@ -251,10 +470,11 @@ class AppiumBridge:
         if action.value:
             element.send_keys(action.value)
 
-        # Auto-hide keyboard after input (unless explicitly disabled in metadata)
+        # Auto-hide keyboard after input (unless explicitly disabled in metadata).
+        # No settle delay needed: Appium serializes the send_keys and
+        # hide_keyboard commands, so the input is complete before hiding.
         auto_hide = action.metadata.get("auto_hide_keyboard", True) if action.metadata else True
-        if auto_hide:
-            time.sleep(0.3)  # Small delay to ensure input is complete
+        if auto_hide and self._is_keyboard_shown():
             self._hide_keyboard()
 
     def _assert_text(self, action: PlannedAction) -> None:
@@ -278,7 +498,7 @@ class AppiumBridge:
             return
 
         # W3C Actions API for swipe
-        actions = ActionBuilder(self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+        actions = self._touch_actions()
         actions.pointer_action.move_to_location(start[0], start[1])
         actions.pointer_action.pointer_down()
         actions.pointer_action.pause(duration_ms / 1000.0)
@@ -311,7 +531,7 @@ class AppiumBridge:
             x, y = coords
 
         # W3C Actions API for long press
-        actions = ActionBuilder(self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+        actions = self._touch_actions()
         actions.pointer_action.move_to_location(x, y)
         actions.pointer_action.pointer_down()
         actions.pointer_action.pause(duration_ms / 1000.0)
@@ -337,6 +557,24 @@ class AppiumBridge:
             # or the method is not supported - this is not critical
             logger.debug(f"hide_keyboard failed (this is normal if keyboard is not shown): {e}")
 
+    def _keyboard_blocking(self) -> bool:
+        """Whether the keyboard might be covering the element we looked for."""
+        if self._keyboard_shown is not None:
+            return self._keyboard_shown
+        return self._is_keyboard_shown()
+
+    def _hide_keyboard_and_wait(self, timeout: float = 0.5) -> None:
+        """Hide the keyboard, polling briefly until it is actually gone."""
+        self._hide_keyboard()
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while time.monotonic() < deadline:
+            if not self._is_keyboard_shown():
+                break
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.2)
+        self._keyboard_shown = False
+
     def _is_keyboard_shown(self) -> bool:
         """Check if keyboard is currently shown."""
         if not self.driver:
@@ -349,12 +587,22 @@ class AppiumBridge:
             logger.debug(f"is_keyboard_shown not supported: {e}")
             return False
 
+    def _get_window_size(self) -> dict:
+        """Get the screen size, cached per session.
+
+        The window size never changes mid-session (orientation changes would
+        need an invalidation hook), so one WebDriver round-trip is enough.
+        """
+        if self._window_size is None:
+            self._window_size = self.driver.get_window_size()
+        return self._window_size
+
     def _scroll_down(self) -> None:
         """Scroll down on the screen."""
         if not self.driver:
             return
         # Get screen size
-        size = self.driver.get_window_size()
+        size = self._get_window_size()
         width = size['width']
         height = size['height']
 
@@ -364,7 +612,7 @@ class AppiumBridge:
         end_x = width // 2
         end_y = int(height * 0.2)
 
-        actions = ActionBuilder(self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+        actions = self._touch_actions()
         actions.pointer_action.move_to_location(start_x, start_y)
         actions.pointer_action.pointer_down()
         actions.pointer_action.pause(0.3)
@@ -377,7 +625,7 @@ class AppiumBridge:
         if not self.driver:
             return
         # Get screen size
-        size = self.driver.get_window_size()
+        size = self._get_window_size()
         width = size['width']
         height = size['height']
 
@@ -387,7 +635,7 @@ class AppiumBridge:
         end_x = width // 2
         end_y = int(height * 0.8)
 
-        actions = ActionBuilder(self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+        actions = self._touch_actions()
         actions.pointer_action.move_to_location(start_x, start_y)
         actions.pointer_action.pointer_down()
         actions.pointer_action.pause(0.3)
@@ -412,13 +660,13 @@ class AppiumBridge:
                 return None
             inferred = node.preferred_locator()
             if inferred:
-                element = self._find_element(inferred["strategy"], inferred["value"])
+                inferred_strategy, inferred_value = inferred
+                element = self._find_element(inferred_strategy, inferred_value)
                 # If element not found and keyboard is shown, try hiding keyboard and retry
-                if not element and self._is_keyboard_shown():
+                if not element and self._keyboard_blocking():
                     logger.info("Element not found, hiding keyboard and retrying...")
-                    self._hide_keyboard()
-                    time.sleep(0.5)  # Wait for keyboard to hide
-                    element = self._find_element(inferred["strategy"], inferred["value"])
+                    self._hide_keyboard_and_wait()
+                    element = self._find_element(inferred_strategy, inferred_value)
                 return element
             coords = _center_of_bounds(node.bounds)
             if coords:
@@ -426,47 +674,51 @@ class AppiumBridge:
             return None
 
         if strategy == "text":
-            xpath = f"//*[@text='{value}' or @content-desc='{value}']"
+            literal = _xpath_literal(value or "")
+            xpath = f"//*[@text={literal} or @content-desc={literal}]"
             try:
                 element = self.driver.find_element(AppiumBy.XPATH, xpath)
                 return element
-            except:
+            except NoSuchElementException:
                 # If element not found and keyboard is shown, try hiding keyboard and retry
-                if self._is_keyboard_shown():
+                if self._keyboard_blocking():
                     logger.info("Element not found, hiding keyboard and retrying...")
-                    self._hide_keyboard()
-                    time.sleep(0.5)  # Wait for keyboard to hide
+                    self._hide_keyboard_and_wait()
                     try:
                         return self.driver.find_element(AppiumBy.XPATH, xpath)
-                    except:
+                    except NoSuchElementException:
                         pass
                 return None
 
         element = self._find_element(strategy, value)
         # If element not found and keyboard is shown, try hiding keyboard and retry
-        if not element and self._is_keyboard_shown():
+        if not element and self._keyboard_blocking():
             logger.info("Element not found, hiding keyboard and retrying...")
-            self._hide_keyboard()
-            time.sleep(0.5)  # Wait for keyboard to hide
+            self._hide_keyboard_and_wait()
             element = self._find_element(strategy, value)
         return element
 
+    _ELEM_CACHE_TTL = 2.0
+
     def _find_element(self, strategy: str | None, value: str | None):
         if not self.driver or not strategy or not value:
             return None
 
-        strategy_map = {
-            "id": AppiumBy.ID,
-            "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
-            "xpath": AppiumBy.XPATH,
-            "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
-            "ios_predicate": AppiumBy.IOS_PREDICATE,
-        }
-
-        by = strategy_map.get(strategy)
+        by = self._strategy_map().get(strategy)
         if not by:
             return None
-        return self.driver.find_element(by, value)
+
+        cache_key = (by, value)
+        cached = self._elem_cache.get(cache_key)
+        if cached:
+            found_at, element = cached
+            if time.monotonic() - found_at < self._ELEM_CACHE_TTL:
+                return element
+            del self._elem_cache[cache_key]
+
+        element = self.driver.find_element(by, value)
+        self._elem_cache[cache_key] = (time.monotonic(), element)
+        return element
 
     def _node_from_index(self, value) -> NodeSnapshot | None:
         if not value:
@@ -494,6 +746,21 @@ class AppiumBridge:
         return None
 
 
+def _xpath_literal(value: str) -> str:
+    """Quote a string for embedding in an XPath expression.
+
+    XPath 1.0 has no escape syntax, so values containing both quote kinds
+    must be split via concat(). Without this, any text with an apostrophe
+    made the first lookup fail and sent us down the slow retry path.
+    """
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = ", \"'\", ".join(f"'{part}'" for part in value.split("'"))
+    return f"concat({parts})"
+
+
 def _center_of_bounds(bounds):
     x1, y1, x2, y2 = bounds
     if x1 == x2 == y1 == y2 == 0:
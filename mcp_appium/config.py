@@ -17,7 +17,9 @@ class AppiumConfig:
 
     @classmethod
     def from_file(cls, path: str | Path) -> "AppiumConfig":
-        payload = json.loads(Path(path).read_text())
+        # json.loads accepts bytes directly; skipping read_text() avoids an
+        # extra decode pass on the cold-start path
+        payload = json.loads(Path(path).read_bytes())
         return cls(
             server_url=payload["server_url"],
             capabilities=payload.get("capabilities", {}),
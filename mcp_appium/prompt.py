@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict
 
-from .node_parser import NodeSnapshot, summarize_nodes
+from .node_parser import NodeSnapshot, iter_prompt_lines
 
 
 PROMPT_TEMPLATE = """You are an expert Appium test agent that works in iterative steps.
@@ -52,11 +52,32 @@ class PromptBuilder:
     device_info: Dict[str, str]
     node_limit: int = 40
 
-    def build(self, request: str, nodes: list[NodeSnapshot], history: str) -> str:
-        return PROMPT_TEMPLATE.format(
-            config=self.device_info,
-            limit=self.node_limit,
-            nodes=summarize_nodes(nodes, limit=self.node_limit) or "<no nodes available>",
-            history=history or "<empty>",
-            request=request,
+    def __post_init__(self) -> None:
+        # config and limit are fixed for the session, so render the
+        # template's static segments once; build() then only joins the
+        # three per-turn values instead of re-parsing the whole template
+        head, _, rest = PROMPT_TEMPLATE.partition("{nodes}")
+        mid_history, _, rest = rest.partition("{history}")
+        mid_request, _, tail = rest.partition("{request}")
+        self._segments = (
+            head.format(config=self.device_info, limit=self.node_limit),
+            mid_history,
+            mid_request,
+            tail,
         )
+
+    def build(self, request: str, nodes: list[NodeSnapshot], history: str) -> str:
+        head, mid_history, mid_request, tail = self._segments
+        # Splice node lines directly into the final join so the nodes
+        # block never exists as its own intermediate string
+        parts = [head]
+        first = True
+        for line in iter_prompt_lines(nodes, limit=self.node_limit):
+            if not first:
+                parts.append("\n")
+            parts.append(line)
+            first = False
+        if first:
+            parts.append("<no nodes available>")
+        parts.extend((mid_history, history or "<empty>", mid_request, request, tail))
+        return "".join(parts)
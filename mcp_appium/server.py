@@ -4,11 +4,14 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Final
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -21,14 +24,59 @@ from mcp_appium.bridge import AppiumBridge
 from mcp_appium.config import AppiumConfig
 from mcp_appium.llm_client import LLMClient
 from mcp_appium.appium_manager import AppiumServerManager
-from mcp_appium.device_manager import detect_android_devices, get_first_available_device, get_device_info
+from mcp_appium.device_manager import (
+    adetect_android_devices,
+    aget_device_info,
+    get_first_available_device,
+    get_device_info,
+)
 
 logger = logging.getLogger(__name__)
 
+try:
+    # Rust JSON encoder that emits UTF-8 directly — several times faster
+    # than json.dumps on the large screen-element payloads
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+
+def _dumps_pretty(obj: Any) -> str:
+    """Serialize `obj` as indent-2 JSON with non-ASCII left intact."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
 # Global instances
 bridge: AppiumBridge | None = None
 appium_manager: AppiumServerManager | None = None
 config_path = Path(__file__).parent.parent / "config" / "appium.json"
+# Whether the bridge holds a live Appium session; lets tool calls skip
+# the reconnect round trip when the previous session is still healthy
+_connected = False
+
+# config_path is fixed, so stringify it into the error text once instead
+# of rebuilding the multi-line f-string on every failed tool call
+_ERROR_TEMPLATE = (
+    "❌ Error in {name}:\n"
+    "\n"
+    "{err}\n"
+    "\n"
+    "Make sure:\n"
+    "1. Appium server is running (appium --base-path /)\n"
+    "2. Device/emulator is connected (adb devices)\n"
+    f"3. Config file exists at {config_path}\n"
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config(path: str, mtime_ns: int) -> AppiumConfig:
+    """Parse the config file once per (path, mtime).
+
+    Tool calls arrive far more often than the file changes; keying on the
+    mtime means editing the config still invalidates the cache.
+    """
+    return AppiumConfig.from_file(Path(path))
 
 
 def get_bridge() -> AppiumBridge:
@@ -40,164 +88,588 @@ def get_bridge() -> AppiumBridge:
                 f"Config file not found: {config_path}. "
                 "Copy config/appium.example.json to config/appium.json"
             )
-        config = AppiumConfig.from_file(config_path)
+        config = _load_config(str(config_path), config_path.stat().st_mtime_ns)
         # Use mock provider by default (no API key needed)
         llm = LLMClient(provider="mock", model="mock")
         bridge = AppiumBridge(config=config, llm_client=llm)
     return bridge
 
 
-async def main():
-    """Run the MCP server."""
-    server = Server("mcp-appium")
-
-    @server.list_tools()
-    async def list_tools() -> list[Tool]:
-        """List available Appium automation tools."""
-        return [
-            Tool(
-                name="setup_appium_connection",
-                description=(
-                    "Automatically setup Appium server and connect to device. "
-                    "This will: 1) Start Appium server if not running, "
-                    "2) Auto-detect connected Android devices using adb, "
-                    "3) Create/update configuration with detected device, "
-                    "4) Connect to the device. "
-                    "Use this as the first step to start automating a mobile device."
-                ),
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "port": {
-                            "type": "integer",
-                            "description": "Appium server port (default: 4723)",
-                        },
-                    },
+def _ensure_connected(appium_bridge: AppiumBridge) -> None:
+    """Connect once and reuse the session across tool calls.
+
+    A full connect() renegotiates capabilities with the Appium server on
+    every request; a cheap session_id check detects a still-healthy
+    session instead. On any connect failure the flag resets so the next
+    call retries from scratch.
+    """
+    global _connected
+    if _connected:
+        driver = appium_bridge.driver
+        if driver is not None and getattr(driver, "session_id", None):
+            return
+        _connected = False
+    try:
+        appium_bridge.connect()
+    except Exception:
+        _connected = False
+        raise
+    _connected = True
+    _element_cache.clear()
+
+
+# Elements already resolved on the current screen, keyed by the locator
+# hints; navigation actions (back/scroll/swipe) invalidate the screen
+_element_cache: dict[tuple[str, str, str], Any] = {}
+
+_webdriver_loaded = False
+_TOUCH: Any = None
+
+
+def _load_webdriver() -> None:
+    """Import the appium/selenium names execute_action needs, once.
+
+    Same deferral as bridge._load_webdriver: the heavy stack stays out of
+    server start-up, and repeated tool calls stop re-running the import
+    statements inside the hot closure. The shared touch PointerInput is
+    safe to reuse because ActionBuilder.perform() drains each device's
+    queued actions.
+    """
+    global AppiumBy, ActionBuilder, PointerInput, interaction
+    global InvalidSessionIdException, StaleElementReferenceException
+    global _TOUCH, _webdriver_loaded
+    if _webdriver_loaded:
+        return
+    from appium.webdriver.common.appiumby import AppiumBy
+    from selenium.common.exceptions import (
+        InvalidSessionIdException,
+        StaleElementReferenceException,
+    )
+    from selenium.webdriver.common.actions import interaction
+    from selenium.webdriver.common.actions.action_builder import ActionBuilder
+    from selenium.webdriver.common.actions.pointer_input import PointerInput
+
+    _TOUCH = PointerInput(interaction.POINTER_TOUCH, "touch")
+    _webdriver_loaded = True
+
+
+def _uiselector_literal(value: str) -> str:
+    """Quote a string for embedding in a UiSelector expression.
+
+    UiSelector arguments are Java string literals, so backslashes must be
+    escaped before quotes — otherwise text containing either character
+    yields a selector parse error and a wasted round trip.
+    """
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _find_by_hints(driver, text: str = "", content_desc: str = "", resource_id: str = ""):
+    """Resolve an element from whichever locator hints were supplied.
+
+    Uses UiAutomator selectors instead of `//*[@text=...]` XPath: the
+    selector runs natively in the UiAutomator2 server against the live
+    accessibility tree, while XPath forces a full page-source dump and a
+    tree walk on every lookup. Resolved elements are cached for the
+    duration of the screen so repeated actions on the same target skip
+    the round trip entirely.
+    """
+    key = (text, content_desc, resource_id)
+    element = _element_cache.get(key)
+    if element is not None:
+        return element
+
+    _load_webdriver()
+
+    selectors = []
+    if text:
+        selectors.append(f"new UiSelector().text({_uiselector_literal(text)})")
+    if content_desc:
+        selectors.append(
+            f"new UiSelector().description({_uiselector_literal(content_desc)})"
+        )
+    if resource_id:
+        selectors.append(
+            f"new UiSelector().resourceId({_uiselector_literal(resource_id)})"
+        )
+
+    # find_elements returns an empty list on a miss, so failed probes do
+    # not pay the NoSuchElementException serialization round trip that
+    # find_element-plus-except did. UiSelector has no OR-union, so
+    # multiple hints still cost one probe each — but the common
+    # single-hint call is exactly one round trip either way.
+    find_elements = driver.find_elements
+    for selector in selectors:
+        matches = find_elements(AppiumBy.ANDROID_UIAUTOMATOR, selector)
+        if matches:
+            element = matches[0]
+            _element_cache[key] = element
+            return element
+    return None
+
+
+# The tool schemas are constant, so build them once at import instead of
+# reconstructing seven Tool objects on every tools/list request. The
+# schema dicts are validated and copied into the Tool models here, so no
+# further freezing is needed — tools/list returns this same list object
+_TOOLS: Final[list[Tool]] = [
+    Tool(
+        name="setup_appium_connection",
+        description=(
+            "Automatically setup Appium server and connect to device. "
+            "This will: 1) Start Appium server if not running, "
+            "2) Auto-detect connected Android devices using adb, "
+            "3) Create/update configuration with detected device, "
+            "4) Connect to the device. "
+            "Use this as the first step to start automating a mobile device."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "port": {
+                    "type": "integer",
+                    "description": "Appium server port (default: 4723)",
+                },
+            },
+        },
+    ),
+    Tool(
+        name="list_devices",
+        description=(
+            "List all connected Android devices detected by adb. "
+            "Shows device UDID, status, and model information. "
+            "Use this to see available devices before setup."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="start_appium_server",
+        description=(
+            "Start the Appium server manually. "
+            "The server will run on the specified port (default: 4723). "
+            "Use this if you want to start the server separately from device setup."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "port": {
+                    "type": "integer",
+                    "description": "Appium server port (default: 4723)",
+                },
+            },
+        },
+    ),
+    Tool(
+        name="stop_appium_server",
+        description=(
+            "Stop the running Appium server. "
+            "Use this to clean up after testing."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="get_screen_elements",
+        description=(
+            "Get all UI elements currently visible on the mobile device screen. "
+            "Returns a list of elements with their text, content-desc, resource-id, and bounds. "
+            "Use this to analyze what's on screen before deciding what action to take."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="execute_action",
+        description=(
+            "Execute a specific Appium action on the mobile device. "
+            "Actions: tap (click element), input_text (type text), swipe (scroll/swipe), "
+            "long_press (long press element), back (press back button), "
+            "hide_keyboard (hide on-screen keyboard), "
+            "scroll_down (scroll down), scroll_up (scroll up)"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["tap", "input_text", "swipe", "long_press", "back", "hide_keyboard", "scroll_down", "scroll_up"],
+                    "description": "The type of action to perform",
+                },
+                "text": {
+                    "type": "string",
+                    "description": "For tap/long_press: text of element to find. For input_text: text to type",
+                },
+                "content_desc": {
+                    "type": "string",
+                    "description": "Content description of element to find (alternative to text)",
                 },
-            ),
-            Tool(
-                name="list_devices",
-                description=(
-                    "List all connected Android devices detected by adb. "
-                    "Shows device UDID, status, and model information. "
-                    "Use this to see available devices before setup."
-                ),
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
+                "resource_id": {
+                    "type": "string",
+                    "description": "Resource ID of element to find (alternative to text)",
                 },
-            ),
-            Tool(
-                name="start_appium_server",
-                description=(
-                    "Start the Appium server manually. "
-                    "The server will run on the specified port (default: 4723). "
-                    "Use this if you want to start the server separately from device setup."
-                ),
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "port": {
-                            "type": "integer",
-                            "description": "Appium server port (default: 4723)",
-                        },
-                    },
+                "x": {
+                    "type": "integer",
+                    "description": "X coordinate for tap/long_press (if element not found by text/id)",
                 },
-            ),
-            Tool(
-                name="stop_appium_server",
-                description=(
-                    "Stop the running Appium server. "
-                    "Use this to clean up after testing."
-                ),
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
+                "y": {
+                    "type": "integer",
+                    "description": "Y coordinate for tap/long_press (if element not found by text/id)",
                 },
-            ),
-            Tool(
-                name="get_screen_elements",
-                description=(
-                    "Get all UI elements currently visible on the mobile device screen. "
-                    "Returns a list of elements with their text, content-desc, resource-id, and bounds. "
-                    "Use this to analyze what's on screen before deciding what action to take."
-                ),
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
+                "duration": {
+                    "type": "integer",
+                    "description": "Duration in milliseconds for long_press (default: 1000)",
                 },
-            ),
-            Tool(
-                name="execute_action",
-                description=(
-                    "Execute a specific Appium action on the mobile device. "
-                    "Actions: tap (click element), input_text (type text), swipe (scroll/swipe), "
-                    "long_press (long press element), back (press back button), "
-                    "hide_keyboard (hide on-screen keyboard), "
-                    "scroll_down (scroll down), scroll_up (scroll up)"
-                ),
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "action": {
-                            "type": "string",
-                            "enum": ["tap", "input_text", "swipe", "long_press", "back", "hide_keyboard", "scroll_down", "scroll_up"],
-                            "description": "The type of action to perform",
-                        },
-                        "text": {
-                            "type": "string",
-                            "description": "For tap/long_press: text of element to find. For input_text: text to type",
-                        },
-                        "content_desc": {
-                            "type": "string",
-                            "description": "Content description of element to find (alternative to text)",
-                        },
-                        "resource_id": {
-                            "type": "string",
-                            "description": "Resource ID of element to find (alternative to text)",
-                        },
-                        "x": {
-                            "type": "integer",
-                            "description": "X coordinate for tap/long_press (if element not found by text/id)",
-                        },
-                        "y": {
-                            "type": "integer",
-                            "description": "Y coordinate for tap/long_press (if element not found by text/id)",
-                        },
-                        "duration": {
-                            "type": "integer",
-                            "description": "Duration in milliseconds for long_press (default: 1000)",
-                        },
-                    },
-                    "required": ["action"],
+            },
+            "required": ["action"],
+        },
+    ),
+    Tool(
+        name="run_test_scenario",
+        description=(
+            "Run an automated test scenario based on natural language description. "
+            "The AI will analyze the screen, create a test plan, and execute it automatically. "
+            "Use this for complex multi-step test scenarios. "
+            "Example: 'Test the login flow with valid credentials', "
+            "'Navigate to settings and verify user profile information', "
+            "'Add an item to cart and proceed to checkout'"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "scenario": {
+                    "type": "string",
+                    "description": "Natural language description of the test scenario to execute",
                 },
-            ),
-            Tool(
-                name="run_test_scenario",
-                description=(
-                    "Run an automated test scenario based on natural language description. "
-                    "The AI will analyze the screen, create a test plan, and execute it automatically. "
-                    "Use this for complex multi-step test scenarios. "
-                    "Example: 'Test the login flow with valid credentials', "
-                    "'Navigate to settings and verify user profile information', "
-                    "'Add an item to cart and proceed to checkout'"
-                ),
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "scenario": {
-                            "type": "string",
-                            "description": "Natural language description of the test scenario to execute",
-                        },
-                        "max_steps": {
-                            "type": "integer",
-                            "description": "Maximum number of steps to execute (default: 10)",
-                        },
-                    },
-                    "required": ["scenario"],
+                "max_steps": {
+                    "type": "integer",
+                    "description": "Maximum number of steps to execute (default: 10)",
                 },
-            ),
-        ]
+            },
+            "required": ["scenario"],
+        },
+    ),
+]
+
+
+def _do_setup(port: int) -> dict:
+    """Blocking setup flow for setup_appium_connection; run in a thread."""
+    global appium_manager, bridge, _connected
+
+    # Step 1: Start Appium server
+    if appium_manager is None:
+        appium_manager = AppiumServerManager(port=port, log_file="appium.log")
+
+    if not appium_manager.is_running():
+        logger.info("Starting Appium server...")
+        if not appium_manager.start(timeout=30):
+            raise RuntimeError("Failed to start Appium server")
+
+    # Step 2: Detect devices
+    logger.info("Detecting connected devices...")
+    device = get_first_available_device()
+    if not device:
+        raise RuntimeError(
+            "No Android devices found. Please ensure:\n"
+            "1. Device is connected via USB or emulator is running\n"
+            "2. USB debugging is enabled\n"
+            "3. Run 'adb devices' to verify connection"
+        )
+
+    # Get detailed device info
+    device_details = get_device_info(device.udid)
+
+    # Step 3: Create/update config
+    config_data = {
+        "server_url": appium_manager.server_url,
+        "capabilities": {
+            "platformName": "Android",
+            "automationName": "UiAutomator2",
+            "deviceName": device_details["model"],
+            "udid": device.udid,
+            "noReset": True,
+            "dontStopAppOnReset": True,
+            "skipDeviceInitialization": True,
+            "skipServerInstallation": True,
+            "newCommandTimeout": 600,
+            "uiautomator2ServerInstallTimeout": 60000,
+            "adbExecTimeout": 20000,
+        },
+        "adb_binary": "adb",
+        "use_accessibility_dump": False,
+    }
+
+    # Write config atomically, and only when the content changed: a
+    # re-setup with the same device leaves the file (and its mtime,
+    # which keys the parsed-config cache) untouched, and the tmp+rename
+    # means a concurrent reader never sees a partial file
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    new_bytes = _dumps_pretty(config_data).encode("utf-8")
+    if not config_path.exists() or config_path.read_bytes() != new_bytes:
+        tmp = config_path.with_suffix(".tmp")
+        tmp.write_bytes(new_bytes)
+        tmp.replace(config_path)
+
+    # Step 4: Create bridge and connect. Elements cached under the old
+    # session are dead references now, so drop them with the session
+    _connected = False
+    _element_cache.clear()
+    config = _load_config(str(config_path), config_path.stat().st_mtime_ns)
+    llm = LLMClient(provider="mock", model="mock")
+    bridge = AppiumBridge(config=config, llm_client=llm)
+    bridge.connect()
+    _connected = True
+
+    return {
+        "server_url": appium_manager.server_url,
+        "device": device_details,
+        "config_path": str(config_path),
+    }
+
+
+def _do_collect(appium_bridge: AppiumBridge) -> list:
+    """Connect (if needed) and collect screen nodes; run in a thread."""
+    _ensure_connected(appium_bridge)
+    return appium_bridge.collect_nodes()
+
+
+def _action_tap(driver, arguments: Any) -> str:
+    # Try to find element by text, content-desc, or resource-id
+    element = _find_by_hints(
+        driver,
+        text=arguments.get("text", ""),
+        content_desc=arguments.get("content_desc", ""),
+        resource_id=arguments.get("resource_id", ""),
+    )
+
+    if element:
+        element.click()
+        # Taps routinely navigate, so treat them like back/scroll and
+        # invalidate the per-screen cache
+        _element_cache.clear()
+        return f"✅ Tapped element: {arguments.get('text') or arguments.get('content_desc') or arguments.get('resource_id')}"
+    elif arguments.get("x") and arguments.get("y"):
+        # Tap by coordinates
+        actions = ActionBuilder(driver, mouse=_TOUCH)
+        actions.pointer_action.move_to_location(arguments["x"], arguments["y"])
+        actions.pointer_action.pointer_down()
+        actions.pointer_action.pointer_up()
+        actions.perform()
+        _element_cache.clear()
+        return f"✅ Tapped at coordinates ({arguments['x']}, {arguments['y']})"
+    else:
+        raise RuntimeError("Element not found and no coordinates provided")
+
+
+def _action_input_text(driver, arguments: Any) -> str:
+    import time
+    text_to_type = arguments.get("text", "")
+
+    # Try to find element by resource_id or content_desc
+    element = _find_by_hints(
+        driver,
+        content_desc=arguments.get("content_desc", ""),
+        resource_id=arguments.get("resource_id", ""),
+    )
+
+    # If no element found, try to use the currently focused element
+    if not element:
+        try:
+            element = driver.switch_to.active_element
+            logger.info("Using active element for input")
+        except Exception as e:
+            logger.debug(f"Could not get active element: {e}")
+
+    # If still no element, try to find first EditText
+    if not element:
+        matches = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.EditText")
+        if matches:
+            element = matches[0]
+            logger.info("Using first EditText as fallback")
+
+    if element and text_to_type:
+        # Poll the field instead of fixed sleeps: fast devices continue
+        # as soon as the state lands, slow ones get the same budget
+        element.clear()
+        for _ in range(10):
+            if not element.text:
+                break
+            time.sleep(0.02)
+        element.send_keys(text_to_type)
+        deadline = time.monotonic() + 0.5
+        while element.text != text_to_type and time.monotonic() < deadline:
+            time.sleep(0.02)
+        # Auto-hide keyboard; it might not be shown, which is fine, but
+        # don't let a bare except swallow KeyboardInterrupt/SystemExit
+        with contextlib.suppress(Exception):
+            driver.hide_keyboard()
+        return f"✅ Entered text: {text_to_type}"
+    else:
+        raise RuntimeError("Could not find input element")
+
+
+def _action_swipe(driver, arguments: Any) -> str:
+    # Simple swipe implementation
+    driver.swipe(500, 1000, 500, 300, 400)
+    _element_cache.clear()
+    return "✅ Swiped"
+
+
+def _action_long_press(driver, arguments: Any) -> str:
+    duration = arguments.get("duration", 1000)
+    element = _find_by_hints(
+        driver,
+        text=arguments.get("text", ""),
+        content_desc=arguments.get("content_desc", ""),
+        resource_id=arguments.get("resource_id", ""),
+    )
+
+    if element:
+        location = element.location
+        size = element.size
+        x = location['x'] + size['width'] // 2
+        y = location['y'] + size['height'] // 2
+    elif arguments.get("x") and arguments.get("y"):
+        x = arguments["x"]
+        y = arguments["y"]
+    else:
+        raise RuntimeError("Element not found and no coordinates provided")
+
+    # W3C Actions API for long press
+    actions = ActionBuilder(driver, mouse=_TOUCH)
+    actions.pointer_action.move_to_location(x, y)
+    actions.pointer_action.pointer_down()
+    actions.pointer_action.pause(duration / 1000.0)
+    actions.pointer_action.pointer_up()
+    actions.perform()
+    # Long presses open menus/navigate just like taps do
+    _element_cache.clear()
+    return f"✅ Long pressed ({duration}ms): {arguments.get('text') or arguments.get('content_desc') or f'({x}, {y})'}"
+
+
+def _action_back(driver, arguments: Any) -> str:
+    driver.back()
+    _element_cache.clear()
+    return "✅ Pressed back button"
+
+
+def _action_hide_keyboard(driver, arguments: Any) -> str:
+    try:
+        driver.hide_keyboard()
+        return "✅ Keyboard hidden"
+    except Exception as e:
+        # Keyboard might not be shown, which is fine
+        return f"ℹ️ Keyboard hide attempted (may already be hidden): {str(e)}"
+
+
+# Window size per Appium session — another HTTP round trip per scroll
+# otherwise. It only changes on rotation, which no current action
+# triggers, so one fetch per session is enough
+_window_size_cache: dict[str, tuple[int, int]] = {}
+
+
+def _window_size(driver) -> tuple[int, int]:
+    cached = _window_size_cache.get(driver.session_id)
+    if cached is None:
+        size = driver.get_window_size()
+        cached = (size['width'], size['height'])
+        _window_size_cache[driver.session_id] = cached
+    return cached
+
+
+def _vertical_scroll(driver, start_frac: float, end_frac: float) -> None:
+    width, height = _window_size(driver)
+    x = width // 2
+
+    actions = ActionBuilder(driver, mouse=_TOUCH)
+    actions.pointer_action.move_to_location(x, int(height * start_frac))
+    actions.pointer_action.pointer_down()
+    actions.pointer_action.pause(0.3)
+    actions.pointer_action.move_to_location(x, int(height * end_frac))
+    actions.pointer_action.pointer_up()
+    actions.perform()
+    _element_cache.clear()
+
+
+def _action_scroll_down(driver, arguments: Any) -> str:
+    _vertical_scroll(driver, 0.8, 0.2)
+    return "✅ Scrolled down"
+
+
+def _action_scroll_up(driver, arguments: Any) -> str:
+    _vertical_scroll(driver, 0.2, 0.8)
+    return "✅ Scrolled up"
+
+
+# O(1) dispatch over the action name instead of a linear elif walk; each
+# handler takes (driver, arguments) so new actions are one entry here
+_ACTION_HANDLERS: Final[dict[str, Any]] = {
+    "tap": _action_tap,
+    "input_text": _action_input_text,
+    "swipe": _action_swipe,
+    "long_press": _action_long_press,
+    "back": _action_back,
+    "hide_keyboard": _action_hide_keyboard,
+    "scroll_down": _action_scroll_down,
+    "scroll_up": _action_scroll_up,
+}
+
+
+def _do_execute(appium_bridge: AppiumBridge, action_type: str, arguments: Any) -> str:
+    """Run one blocking UI action; called via asyncio.to_thread.
+
+    Module-level rather than a per-call closure so CPython's adaptive
+    specialization sees one stable code object instead of a fresh one
+    per tool call, and profilers show the action path as a distinct
+    symbol.
+    """
+    global _connected
+
+    handler = _ACTION_HANDLERS.get(action_type)
+    if handler is None:
+        raise ValueError(f"Unknown action: {action_type}")
+
+    _ensure_connected(appium_bridge)
+    _load_webdriver()
+    try:
+        return handler(appium_bridge.driver, arguments)
+    except StaleElementReferenceException:
+        # A cached element outlived its screen; evict the cache and
+        # resolve fresh once instead of failing every retry
+        _element_cache.clear()
+        return handler(appium_bridge.driver, arguments)
+    except InvalidSessionIdException:
+        # The session died under us; reconnect and retry once
+        _connected = False
+        _element_cache.clear()
+        _ensure_connected(appium_bridge)
+        return handler(appium_bridge.driver, arguments)
+
+
+async def main():
+    """Run the MCP server."""
+    # All blocking Appium/adb work funnels through asyncio.to_thread;
+    # install the pool up front with named threads (instead of letting
+    # the default executor spin up lazily) and prewarm one worker so the
+    # first tool call doesn't pay thread start-up latency
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=16, thread_name_prefix="mcp-appium")
+    )
+    await loop.run_in_executor(None, lambda: None)
+
+    server = Server("mcp-appium")
+
+    @server.list_tools()
+    async def list_tools() -> list[Tool]:
+        """List available Appium automation tools."""
+        return _TOOLS
 
     @server.call_tool()
     async def call_tool(name: str, arguments: Any) -> list[TextContent]:
@@ -207,70 +679,7 @@ async def main():
         try:
             if name == "setup_appium_connection":
                 port = arguments.get("port", 4723)
-
-                def setup():
-                    global appium_manager, bridge
-
-                    # Step 1: Start Appium server
-                    if appium_manager is None:
-                        appium_manager = AppiumServerManager(port=port, log_file="appium.log")
-
-                    if not appium_manager.is_running():
-                        logger.info("Starting Appium server...")
-                        if not appium_manager.start(timeout=30):
-                            raise RuntimeError("Failed to start Appium server")
-
-                    # Step 2: Detect devices
-                    logger.info("Detecting connected devices...")
-                    device = get_first_available_device()
-                    if not device:
-                        raise RuntimeError(
-                            "No Android devices found. Please ensure:\n"
-                            "1. Device is connected via USB or emulator is running\n"
-                            "2. USB debugging is enabled\n"
-                            "3. Run 'adb devices' to verify connection"
-                        )
-
-                    # Get detailed device info
-                    device_details = get_device_info(device.udid)
-
-                    # Step 3: Create/update config
-                    config_data = {
-                        "server_url": appium_manager.server_url,
-                        "capabilities": {
-                            "platformName": "Android",
-                            "automationName": "UiAutomator2",
-                            "deviceName": device_details["model"],
-                            "udid": device.udid,
-                            "noReset": True,
-                            "dontStopAppOnReset": True,
-                            "skipDeviceInitialization": True,
-                            "skipServerInstallation": True,
-                            "newCommandTimeout": 600,
-                            "uiautomator2ServerInstallTimeout": 60000,
-                            "adbExecTimeout": 20000,
-                        },
-                        "adb_binary": "adb",
-                        "use_accessibility_dump": False,
-                    }
-
-                    # Write config
-                    config_path.parent.mkdir(parents=True, exist_ok=True)
-                    config_path.write_text(json.dumps(config_data, indent=2))
-
-                    # Step 4: Create bridge and connect
-                    config = AppiumConfig.from_file(config_path)
-                    llm = LLMClient(provider="mock", model="mock")
-                    bridge = AppiumBridge(config=config, llm_client=llm)
-                    bridge.connect()
-
-                    return {
-                        "server_url": appium_manager.server_url,
-                        "device": device_details,
-                        "config_path": str(config_path),
-                    }
-
-                result = await asyncio.to_thread(setup)
+                result = await asyncio.to_thread(_do_setup, port)
 
                 response = f"""✅ Appium Setup Complete!
 
@@ -284,23 +693,34 @@ You can now use get_screen_elements, execute_action, and other tools to automate
                 return [TextContent(type="text", text=response)]
 
             elif name == "list_devices":
-                def list_devs():
-                    devices = detect_android_devices()
+                async def list_devs():
+                    # Async adb calls keep the event loop free for other tools
+                    devices = await adetect_android_devices()
                     if not devices:
                         return {"devices": [], "count": 0}
 
+                    # Detailed info costs one getprop round trip per online
+                    # device; gather runs them concurrently so N devices
+                    # cost ~1 round trip of wall clock instead of N
+                    online = [dev for dev in devices if dev.status == "device"]
+                    details = await asyncio.gather(
+                        *(aget_device_info(dev.udid) for dev in online)
+                    )
+                    info_by_udid = {
+                        dev.udid: info for dev, info in zip(online, details)
+                    }
+
                     device_list = []
                     for dev in devices:
                         dev_dict = dev.to_dict()
-                        if dev.status == "device":
-                            # Get detailed info for online devices
-                            details = get_device_info(dev.udid)
-                            dev_dict.update(details)
+                        info = info_by_udid.get(dev.udid)
+                        if info:
+                            dev_dict.update(info)
                         device_list.append(dev_dict)
 
                     return {"devices": device_list, "count": len(device_list)}
 
-                result = await asyncio.to_thread(list_devs)
+                result = await list_devs()
 
                 if result["count"] == 0:
                     response = """📱 No Android devices found.
@@ -313,7 +733,7 @@ Please ensure:
                 else:
                     response = f"""📱 Found {result['count']} device(s):
 
-{json.dumps(result['devices'], indent=2, ensure_ascii=False)}
+{_dumps_pretty(result['devices'])}
 """
                 return [TextContent(type="text", text=response)]
 
@@ -363,31 +783,30 @@ Please ensure:
                 return [TextContent(type="text", text=response)]
 
             elif name == "get_screen_elements":
-                # Get or create bridge
+                # Get or create bridge, connect (if needed) and collect
                 appium_bridge = get_bridge()
-
-                # Connect and collect screen elements
-                def collect():
-                    appium_bridge.connect()
-                    return appium_bridge.collect_nodes()
-
-                nodes = await asyncio.to_thread(collect)
-
-                # Format elements as JSON
-                elements = []
-                for i, node in enumerate(nodes, 1):
-                    elements.append({
+                nodes = await asyncio.to_thread(_do_collect, appium_bridge)
+
+                # Format elements as JSON. The per-node dict layout is the
+                # tool's output contract (the agent reads these records),
+                # so keep the shape and build it in one comprehension —
+                # no per-iteration append lookup, and the constant keys
+                # are shared interned strings rather than fresh objects
+                elements = [
+                    {
                         "index": i,
                         "text": node.text,
                         "content_desc": node.content_desc,
                         "resource_id": node.resource_id,
                         "bounds": node.bounds,
                         "class_name": node.class_name,
-                    })
+                    }
+                    for i, node in enumerate(nodes, 1)
+                ]
 
                 result = f"""📱 Screen Elements ({len(elements)} found):
 
-{json.dumps(elements, indent=2, ensure_ascii=False)}
+{_dumps_pretty(elements)}
 
 Use execute_action to interact with these elements.
 """
@@ -399,199 +818,9 @@ Use execute_action to interact with these elements.
                     raise ValueError("action is required")
 
                 appium_bridge = get_bridge()
-                appium_bridge.connect()
-
-                def execute():
-                    from appium.webdriver.common.appiumby import AppiumBy
-                    from selenium.webdriver.common.actions.action_builder import ActionBuilder
-                    from selenium.webdriver.common.actions.pointer_input import PointerInput
-                    from selenium.webdriver.common.actions import interaction
-
-                    driver = appium_bridge.driver
-
-                    if action_type == "tap":
-                        # Try to find element by text, content-desc, or resource-id
-                        element = None
-
-                        if arguments.get("text"):
-                            try:
-                                element = driver.find_element(AppiumBy.XPATH, f"//*[@text='{arguments['text']}']")
-                            except:
-                                pass
-
-                        if not element and arguments.get("content_desc"):
-                            try:
-                                element = driver.find_element(AppiumBy.XPATH, f"//*[@content-desc='{arguments['content_desc']}']")
-                            except:
-                                pass
-
-                        if not element and arguments.get("resource_id"):
-                            try:
-                                element = driver.find_element(AppiumBy.ID, arguments["resource_id"])
-                            except:
-                                pass
-
-                        if element:
-                            element.click()
-                            return f"✅ Tapped element: {arguments.get('text') or arguments.get('content_desc') or arguments.get('resource_id')}"
-                        elif arguments.get("x") and arguments.get("y"):
-                            # Tap by coordinates
-                            actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
-                            actions.pointer_action.move_to_location(arguments["x"], arguments["y"])
-                            actions.pointer_action.pointer_down()
-                            actions.pointer_action.pointer_up()
-                            actions.perform()
-                            return f"✅ Tapped at coordinates ({arguments['x']}, {arguments['y']})"
-                        else:
-                            raise RuntimeError("Element not found and no coordinates provided")
-
-                    elif action_type == "input_text":
-                        import time
-                        element = None
-                        text_to_type = arguments.get("text", "")
-
-                        # Try to find element by resource_id or content_desc
-                        if arguments.get("resource_id"):
-                            try:
-                                element = driver.find_element(AppiumBy.ID, arguments["resource_id"])
-                            except:
-                                pass
-                        elif arguments.get("content_desc"):
-                            try:
-                                element = driver.find_element(AppiumBy.XPATH, f"//*[@content-desc='{arguments['content_desc']}']")
-                            except:
-                                pass
-
-                        # If no element found, try to use the currently focused element
-                        if not element:
-                            try:
-                                element = driver.switch_to.active_element
-                                logger.info("Using active element for input")
-                            except Exception as e:
-                                logger.debug(f"Could not get active element: {e}")
-
-                        # If still no element, try to find first EditText
-                        if not element:
-                            try:
-                                element = driver.find_element(AppiumBy.CLASS_NAME, "android.widget.EditText")
-                                logger.info("Using first EditText as fallback")
-                            except:
-                                pass
-
-                        if element and text_to_type:
-                            element.clear()
-                            time.sleep(0.2)  # Small delay after clear
-                            element.send_keys(text_to_type)
-                            time.sleep(0.3)  # Small delay after sending keys
-                            # Auto-hide keyboard
-                            try:
-                                driver.hide_keyboard()
-                            except:
-                                pass  # Keyboard might not be shown
-                            return f"✅ Entered text: {text_to_type}"
-                        else:
-                            raise RuntimeError("Could not find input element")
-
-                    elif action_type == "swipe":
-                        # Simple swipe implementation
-                        driver.swipe(500, 1000, 500, 300, 400)
-                        return "✅ Swiped"
-
-                    elif action_type == "long_press":
-                        # Long press implementation
-                        element = None
-                        duration = arguments.get("duration", 1000)
-
-                        if arguments.get("text"):
-                            try:
-                                element = driver.find_element(AppiumBy.XPATH, f"//*[@text='{arguments['text']}']")
-                            except:
-                                pass
-
-                        if not element and arguments.get("content_desc"):
-                            try:
-                                element = driver.find_element(AppiumBy.XPATH, f"//*[@content-desc='{arguments['content_desc']}']")
-                            except:
-                                pass
-
-                        if not element and arguments.get("resource_id"):
-                            try:
-                                element = driver.find_element(AppiumBy.ID, arguments["resource_id"])
-                            except:
-                                pass
-
-                        if element:
-                            location = element.location
-                            size = element.size
-                            x = location['x'] + size['width'] // 2
-                            y = location['y'] + size['height'] // 2
-                        elif arguments.get("x") and arguments.get("y"):
-                            x = arguments["x"]
-                            y = arguments["y"]
-                        else:
-                            raise RuntimeError("Element not found and no coordinates provided")
-
-                        # W3C Actions API for long press
-                        actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
-                        actions.pointer_action.move_to_location(x, y)
-                        actions.pointer_action.pointer_down()
-                        actions.pointer_action.pause(duration / 1000.0)
-                        actions.pointer_action.pointer_up()
-                        actions.perform()
-                        return f"✅ Long pressed ({duration}ms): {arguments.get('text') or arguments.get('content_desc') or f'({x}, {y})'}"
-
-                    elif action_type == "back":
-                        driver.back()
-                        return "✅ Pressed back button"
-
-                    elif action_type == "hide_keyboard":
-                        try:
-                            driver.hide_keyboard()
-                            return "✅ Keyboard hidden"
-                        except Exception as e:
-                            # Keyboard might not be shown, which is fine
-                            return f"ℹ️ Keyboard hide attempted (may already be hidden): {str(e)}"
-
-                    elif action_type == "scroll_down":
-                        size = driver.get_window_size()
-                        width = size['width']
-                        height = size['height']
-                        start_x = width // 2
-                        start_y = int(height * 0.8)
-                        end_x = width // 2
-                        end_y = int(height * 0.2)
-
-                        actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
-                        actions.pointer_action.move_to_location(start_x, start_y)
-                        actions.pointer_action.pointer_down()
-                        actions.pointer_action.pause(0.3)
-                        actions.pointer_action.move_to_location(end_x, end_y)
-                        actions.pointer_action.pointer_up()
-                        actions.perform()
-                        return "✅ Scrolled down"
-
-                    elif action_type == "scroll_up":
-                        size = driver.get_window_size()
-                        width = size['width']
-                        height = size['height']
-                        start_x = width // 2
-                        start_y = int(height * 0.2)
-                        end_x = width // 2
-                        end_y = int(height * 0.8)
-
-                        actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
-                        actions.pointer_action.move_to_location(start_x, start_y)
-                        actions.pointer_action.pointer_down()
-                        actions.pointer_action.pause(0.3)
-                        actions.pointer_action.move_to_location(end_x, end_y)
-                        actions.pointer_action.pointer_up()
-                        actions.perform()
-                        return "✅ Scrolled up"
-
-                    else:
-                        raise ValueError(f"Unknown action: {action_type}")
-
-                result = await asyncio.to_thread(execute)
+                result = await asyncio.to_thread(
+                    _do_execute, appium_bridge, action_type, arguments
+                )
                 return [TextContent(type="text", text=result)]
 
             elif name == "run_test_scenario":
@@ -628,15 +857,7 @@ Use execute_action to interact with these elements.
 
         except Exception as e:
             logger.exception(f"Error in {name}")
-            error_msg = f"""❌ Error in {name}:
-
-{str(e)}
-
-Make sure:
-1. Appium server is running (appium --base-path /)
-2. Device/emulator is connected (adb devices)
-3. Config file exists at {config_path}
-"""
+            error_msg = _ERROR_TEMPLATE.format(name=name, err=e)
             return [TextContent(type="text", text=error_msg)]
 
     # Run the server
@@ -644,6 +865,24 @@ Make sure:
         await server.run(read_stream, write_stream, server.create_initialization_options())
 
 
+def _configure_event_loop() -> None:
+    """Pick the fastest available event loop for this platform.
+
+    uvloop is a drop-in libuv loop that cuts per-I/O overhead on POSIX.
+    Windows keeps the default proactor loop: the selector loop has no
+    subprocess support, and list_devices drives adb through
+    asyncio.create_subprocess_exec.
+    """
+    if sys.platform != "win32":
+        try:
+            import uvloop
+
+            uvloop.install()
+        except ImportError:  # pragma: no cover - optional dependency
+            pass
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
+    _configure_event_loop()
     asyncio.run(main())